@@ -9,39 +9,50 @@ Author: Generated with Claude Code
 """
 
 import sys
-import subprocess
 from pathlib import Path
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QTextEdit, QFileDialog
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, Signal, Slot, QObject, QRunnable, QThreadPool
+from PySide6.QtGui import QFont, QTextCursor
 
+# Import from the CLI module - generation runs in-process, no subprocess
+from l5x_state_diagram import run as run_l5x_generator
 
-def get_resource_path(relative_path):
-    """
-    Get absolute path to resource, works for dev and for PyInstaller.
 
-    When PyInstaller bundles the app, it extracts files to a temporary folder
-    and stores the path in sys._MEIPASS. This function returns the correct path
-    whether running from source or as a bundled executable.
+class WorkerSignals(QObject):
+    """Signals emitted by the generation worker (signals must live on a QObject)."""
 
-    Args:
-        relative_path: Relative path to the resource file
+    log = Signal(str, str)        # message, level
+    done = Signal(int, str, str)  # return code, output file, error text
 
-    Returns:
-        Absolute path to the resource
-    """
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except AttributeError:
-        # Running in normal Python environment (development)
-        base_path = Path(__file__).parent
 
-    return Path(base_path) / relative_path
+class Worker(QRunnable):
+    """Runs the diagram generator on a thread-pool thread to keep the GUI responsive."""
+
+    def __init__(self, input_file, output_file, tag_name=None):
+        super().__init__()
+        self.input_file = input_file
+        self.output_file = output_file
+        self.tag_name = tag_name
+        self.signals = WorkerSignals()
+
+    @Slot()
+    def run(self):
+        """Run the generator, forwarding log lines and completion via signals."""
+        try:
+            run_l5x_generator(
+                self.input_file,
+                self.output_file,
+                tag=self.tag_name,
+                log=lambda message: self.signals.log.emit(str(message), 'info')
+            )
+        except Exception as e:
+            self.signals.done.emit(1, self.output_file, str(e))
+        else:
+            self.signals.done.emit(0, self.output_file, '')
 
 
 # Stylesheet for the application
@@ -135,10 +146,11 @@ class DropZoneWidget(QLabel):
     def dragEnterEvent(self, event):
         """Handle drag enter event - check if file is .L5X"""
         if event.mimeData().hasUrls():
-            # Check if any URL ends with .L5X (case-insensitive)
+            # Check if any URL ends with .L5X (case-insensitive); only the
+            # 4-char extension is lowercased rather than copying whole paths
             for url in event.mimeData().urls():
                 file_path = url.toLocalFile()
-                if file_path.upper().endswith('.L5X'):
+                if file_path[-4:].lower() == '.l5x':
                     event.accept()
                     self.setObjectName("dropZoneHover")
                     self.style().unpolish(self)
@@ -155,7 +167,7 @@ class DropZoneWidget(QLabel):
     def dropEvent(self, event):
         """Handle drop event - emit signal with file path"""
         files = [u.toLocalFile() for u in event.mimeData().urls()]
-        l5x_files = [f for f in files if f.upper().endswith('.L5X')]
+        l5x_files = [f for f in files if f[-4:].lower() == '.l5x']
         if l5x_files:
             self.fileDropped.emit(l5x_files[0])
 
@@ -256,15 +268,16 @@ class L5XMermaidGUI(QMainWindow):
     def on_file_dropped(self, filepath):
         """Handle file drop/selection event."""
         self.input_file = filepath
-        filename = Path(filepath).name
+
+        # Parse the path once and reuse it for name/stem/output derivation
+        input_path = Path(filepath)
+        filename = input_path.name
 
         # Update drop zone
         self.drop_zone.setText(f'✓ {filename}\n\n(click to change)')
 
         # Auto-generate output file path
-        default_output = Path(filepath).with_name(
-            f'{Path(filepath).stem}_state_diagram.md'
-        )
+        default_output = input_path.with_name(f'{input_path.stem}_state_diagram.md')
         self.output_file = str(default_output)
         self.output_input.setText(str(default_output))
 
@@ -273,28 +286,36 @@ class L5XMermaidGUI(QMainWindow):
 
         # Update status
         self.clear_status()
-        self.add_status(f'Loaded: {filename}', 'success')
-        self.add_status('✓ Input file ready', 'info')
+        self.add_status_bulk([
+            (f'Loaded: {filename}', 'success'),
+            ('✓ Input file ready', 'info'),
+        ])
 
     def browse_input_file(self):
-        """Open file dialog to select input .L5X file."""
-        filepath, _ = QFileDialog.getOpenFileName(
+        """
+        Open file dialog to select input .L5X file.
+
+        The dialog is shown non-modally via open() so slow directory
+        enumeration (e.g. network mounts on Windows) doesn't stall the
+        event loop the way the static getOpenFileName call did.
+        """
+        dialog = QFileDialog(
             self,
             'Select L5X File',
             '',
             'L5X Files (*.L5X);;All Files (*)'
         )
-
-        if filepath:
-            self.on_file_dropped(filepath)
+        dialog.setFileMode(QFileDialog.ExistingFile)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.fileSelected.connect(self.on_file_dropped)
+        dialog.open()
 
     def browse_output_file(self):
         """Open save file dialog to select output location."""
         default_name = ''
         if self.input_file:
-            default_name = str(Path(self.input_file).with_name(
-                f'{Path(self.input_file).stem}_state_diagram.md'
-            ))
+            input_path = Path(self.input_file)
+            default_name = str(input_path.with_name(f'{input_path.stem}_state_diagram.md'))
 
         filepath, _ = QFileDialog.getSaveFileName(
             self,
@@ -312,6 +333,25 @@ class L5XMermaidGUI(QMainWindow):
         """Clear the status box."""
         self.status_box.clear()
 
+    STATUS_COLORS = {
+        'info': '#333333',
+        'success': '#4CAF50',
+        'error': '#f44336',
+        'warning': '#ff9800'
+    }
+
+    def _format_status(self, message, level):
+        """Format one status message as a colored HTML span."""
+        color = self.STATUS_COLORS.get(level, self.STATUS_COLORS['info'])
+
+        # Add timestamp for non-info messages
+        if level in ['success', 'error']:
+            import datetime
+            timestamp = datetime.datetime.now().strftime('%H:%M:%S')
+            message = f'[{timestamp}] {message}'
+
+        return f'<span style="color: {color};">{message}</span>'
+
     def add_status(self, message, level='info'):
         """
         Add a message to the status box with appropriate coloring.
@@ -320,22 +360,32 @@ class L5XMermaidGUI(QMainWindow):
             message: The message to display
             level: Message level ('info', 'success', 'error', 'warning')
         """
-        colors = {
-            'info': '#333333',
-            'success': '#4CAF50',
-            'error': '#f44336',
-            'warning': '#ff9800'
-        }
+        self.status_box.append(self._format_status(message, level))
 
-        color = colors.get(level, colors['info'])
+        # Auto-scroll to bottom
+        scrollbar = self.status_box.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
 
-        # Add timestamp for non-info messages
-        if level in ['success', 'error']:
-            import datetime
-            timestamp = datetime.datetime.now().strftime('%H:%M:%S')
-            message = f'[{timestamp}] {message}'
+    def add_status_bulk(self, messages):
+        """
+        Add several messages to the status box with one document insertion.
+
+        One insertHtml means one QTextDocument relayout and one scrollbar
+        update for the whole batch, instead of one per line.
+
+        Args:
+            messages: Iterable of (message, level) tuples
+        """
+        html = '<br>'.join(
+            self._format_status(message, level) for message, level in messages
+        )
 
-        self.status_box.append(f'<span style="color: {color};">{message}</span>')
+        cursor = self.status_box.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        if not self.status_box.document().isEmpty():
+            cursor.insertHtml('<br>')
+        cursor.insertHtml(html)
+        self.status_box.setTextCursor(cursor)
 
         # Auto-scroll to bottom
         scrollbar = self.status_box.verticalScrollBar()
@@ -352,83 +402,45 @@ class L5XMermaidGUI(QMainWindow):
             self.add_status('✗ No output file selected', 'error')
             return
 
-        # Clear previous status and start
+        # Clear previous status and start - one batched insertion
         self.clear_status()
-        self.add_status('Starting diagram generation...', 'info')
-        self.add_status(f'Input: {Path(self.input_file).name}', 'info')
-        self.add_status(f'Output: {Path(self.output_file).name}', 'info')
+        messages = [
+            ('Starting diagram generation...', 'info'),
+            (f'Input: {Path(self.input_file).name}', 'info'),
+            (f'Output: {Path(self.output_file).name}', 'info'),
+        ]
 
         # Get tag name if provided
         tag_name = self.tag_input.text().strip()
         if tag_name:
-            self.add_status(f'Using tag: {tag_name}', 'info')
+            messages.append((f'Using tag: {tag_name}', 'info'))
+
+        messages.append(('', 'info'))  # Blank line
+        self.add_status_bulk(messages)
 
         # Disable generate button during processing
         self.generate_btn.setEnabled(False)
-        self.add_status('', 'info')  # Blank line
-
-        try:
-            # Run the CLI script
-            result = self.run_l5x_generator(
-                self.input_file,
-                self.output_file,
-                tag_name if tag_name else None
-            )
-
-            # Process output
-            if result.stdout:
-                for line in result.stdout.strip().split('\n'):
-                    if line:
-                        self.add_status(line, 'info')
-
-            # Check result
-            if result.returncode == 0:
-                self.add_status('', 'info')  # Blank line
-                self.add_status(f'✓ Success! Diagram saved to: {self.output_file}', 'success')
-            else:
-                # Show errors
-                if result.stderr:
-                    self.add_status('', 'info')  # Blank line
-                    for line in result.stderr.strip().split('\n'):
-                        if line:
-                            self.add_status(f'✗ {line}', 'error')
-                else:
-                    self.add_status('✗ Error: Process failed', 'error')
 
-        except Exception as e:
-            self.add_status('', 'info')  # Blank line
-            self.add_status(f'✗ Error: {str(e)}', 'error')
-
-        finally:
-            # Re-enable generate button
-            self.generate_btn.setEnabled(True)
-
-    def run_l5x_generator(self, input_file, output_file, tag_name=None):
-        """
-        Run the L5X state diagram generator as a subprocess.
-
-        Args:
-            input_file: Path to input .L5X file
-            output_file: Path to output .md file
-            tag_name: Optional tag name
-
-        Returns:
-            subprocess.CompletedProcess object
-        """
-        script_path = get_resource_path('l5x_state_diagram.py')
-
-        cmd = [sys.executable, str(script_path), input_file, '-o', output_file]
-        if tag_name:
-            cmd.extend(['-t', tag_name])
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=None  # Use current working directory, not bundled temp folder
+        # Run the generator on a worker thread so the event loop keeps painting
+        worker = Worker(
+            self.input_file,
+            self.output_file,
+            tag_name if tag_name else None
         )
+        worker.signals.log.connect(self.add_status)
+        worker.signals.done.connect(self._on_finished)
+        QThreadPool.globalInstance().start(worker)
 
-        return result
+    def _on_finished(self, returncode, output_file, error):
+        """Handle worker completion - report result and re-enable the button."""
+        self.add_status('', 'info')  # Blank line
+        if returncode == 0:
+            self.add_status(f'✓ Success! Diagram saved to: {output_file}', 'success')
+        else:
+            self.add_status(f'✗ Error: {error}', 'error')
+
+        # Re-enable generate button
+        self.generate_btn.setEnabled(True)
 
 
 def main():
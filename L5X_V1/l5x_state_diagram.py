@@ -10,13 +10,22 @@ Usage:
 Author: Generated with Claude Code
 """
 
-import l5x
 import re
 import sys
 import argparse
+import xml.etree.ElementTree as ET
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 
+# Compiled once at import - parse_rung_logic runs per rung, so per-call
+# re-cache lookups add up on large routines
+_INSTR_RE = re.compile(r'(XIC|OTL)\(([^)]+)\)')
+
+# Parentheses break Mermaid node labels - swapped for angle brackets in one
+# translate pass instead of chained replace calls
+_NAME_TABLE = str.maketrans({'(': '<', ')': '>'})
+
 
 def extract_state_number(tag_reference: str) -> Optional[int]:
     """
@@ -32,42 +41,58 @@ def extract_state_number(tag_reference: str) -> Optional[int]:
     Returns:
         State number or None if not found
     """
-    match = re.search(r'\.(\d+)$', tag_reference)
-    if match:
-        return int(match.group(1))
+    # The pattern is just a trailing '.digits' - rpartition + isdigit are
+    # pure C string ops, much cheaper than the regex engine per call
+    tail = tag_reference.rpartition('.')[2]
+    if tail.isdigit():
+        return int(tail)
     return None
 
 
-def get_state_name(prj: l5x.Project, tag_name: str, state_num: int) -> str:
+def _resolve_st0(prj: 'l5x.Project', tag_name: str):
     """
-    Get the descriptive name for a state from tag bit description.
+    Resolve the ST[0] member of a state tag once for reuse across lookups.
 
     Args:
         prj: L5X Project object
         tag_name: Name of the state tag (e.g., '_A28_PH')
+
+    Returns:
+        The tag's ST[0] array element (holds state bits 0-31)
+    """
+    return prj.controller.tags[tag_name]['ST'][0]
+
+
+def get_state_name(st0, state_num: int) -> str:
+    """
+    Get the descriptive name for a state from a pre-resolved ST[0] member.
+
+    Resolving the tag once via _resolve_st0 and passing it in avoids
+    re-walking the tag tree for every state in the loop.
+
+    Args:
+        st0: Pre-resolved ST[0] member (see _resolve_st0)
         state_num: State number (bit number)
 
     Returns:
         State name string (fallback to "State {num}" if not found)
     """
-    try:
-        tag = prj.controller.tags[tag_name]
-        st_0 = tag['ST'][0]
-        bit = st_0[state_num]
-        description = bit.description
-
-        if description:
-            lines = description.strip().split('\n')
-            # First line is "State X", remaining lines are the name
-            if len(lines) > 1:
-                state_name = '\n'.join(lines[1:]).strip()
-                return state_name
-
+    # Bit bounds are known up front (len(st0) is the DINT's bit width), so
+    # the common path indexes directly with no try/except frame per state
+    if not 0 <= state_num < len(st0):
+        print(f"Warning: state {state_num} is out of range for the state tag", file=sys.stderr)
         return f"State {state_num}"
 
-    except (KeyError, IndexError, Exception) as e:
-        print(f"Warning: Could not get name for state {state_num}: {e}", file=sys.stderr)
-        return f"State {state_num}"
+    description = st0[state_num].description
+
+    if description:
+        lines = description.strip().split('\n')
+        # First line is "State X", remaining lines are the name
+        if len(lines) > 1:
+            state_name = '\n'.join(lines[1:]).strip()
+            return state_name
+
+    return f"State {state_num}"
 
 
 def find_state_logic_section(rll_content) -> Optional[int]:
@@ -89,6 +114,38 @@ def find_state_logic_section(rll_content) -> Optional[int]:
     return None
 
 
+def _parse_logic(logic: str) -> Tuple[Optional[int], List[int]]:
+    """
+    Extract source state (XIC) and target states (OTL) from rung logic text.
+
+    Args:
+        logic: Stripped ladder logic text of a single rung
+
+    Returns:
+        Tuple of (source_state_number, [target_state_numbers])
+        Returns (None, []) if rung is NOP or has no XIC
+    """
+    # Skip NOP() rungs
+    if logic.startswith('NOP()'):
+        return (None, [])
+
+    # One scan picks up the leading XIC (source) and every OTL (targets)
+    source_state = None
+    target_states = []
+    for match in _INSTR_RE.finditer(logic):
+        instruction, tag = match.group(1), match.group(2)
+        if instruction == 'XIC':
+            # Only a rung-leading XIC identifies the source state
+            if match.start() == 0:
+                source_state = extract_state_number(tag)
+        else:
+            target_state = extract_state_number(tag)
+            if target_state is not None:
+                target_states.append(target_state)
+
+    return (source_state, target_states)
+
+
 def parse_rung_logic(rung) -> Tuple[Optional[int], List[int]]:
     """
     Parse a rung to extract source state (XIC) and target states (OTL).
@@ -108,150 +165,257 @@ def parse_rung_logic(rung) -> Tuple[Optional[int], List[int]]:
     if text_cdata is None or not text_cdata.text:
         return (None, [])
 
-    logic = text_cdata.text.strip()
-
-    # Skip NOP() rungs
-    if logic.startswith('NOP()'):
-        return (None, [])
-
-    # Extract source state from first XIC
-    source_state = None
-    xic_match = re.match(r'XIC\(([^)]+)\)', logic)
-    if xic_match:
-        xic_tag = xic_match.group(1)
-        source_state = extract_state_number(xic_tag)
-
-    # Extract target states from all OTL instructions
-    target_states = []
-    otl_matches = re.findall(r'OTL\(([^)]+)\)', logic)
-    for otl_tag in otl_matches:
-        target_state = extract_state_number(otl_tag)
-        if target_state is not None:
-            target_states.append(target_state)
-
-    return (source_state, target_states)
+    return _parse_logic(text_cdata.text.strip())
 
 
 def build_state_transitions(
     rll_content,
-    start_index: int,
+    start_marker: str = "STATE LOGIC",
     end_marker: str = "FAULT"
-) -> Dict[int, Set[int]]:
+) -> Optional[Dict[int, Set[int]]]:
     """
     Build a map of state transitions from the STATE LOGIC section.
 
+    Scans the rungs once: locates the STATE LOGIC marker comment, skips the
+    cleanup rung that follows it, then collects transitions until the end
+    marker. This replaces the separate marker pre-scan plus indexed re-walk,
+    so each rung's Comment/Text is only looked up one time.
+
     Args:
         rll_content: RLLContent XML element
-        start_index: Index where STATE LOGIC section starts
+        start_marker: Comment text that marks start of STATE LOGIC section
         end_marker: Comment text that marks end of STATE LOGIC section
 
     Returns:
-        Dict mapping source_state -> set of target_states
+        Dict mapping source_state -> set of target_states,
+        or None if no STATE LOGIC section was found
     """
-    state_transitions = {}
-    rungs_list = list(rll_content)
-
-    # Start from start_index + 2 to skip marker and cleanup rung
-    for i in range(start_index + 2, len(rungs_list)):
-        rung = rungs_list[i]
+    state_transitions = None
+    collecting = False
+    skip_cleanup = False
 
-        # Check if we've reached the end of STATE LOGIC section
+    for rung in rll_content:
+        # Each rung's comment is looked up once and reused for both markers
+        comment_text = None
         comment = rung.find('Comment')
         if comment is not None:
             cdata = comment.find('CDATAContent')
-            if cdata is not None and cdata.text and end_marker in cdata.text:
-                break
+            if cdata is not None and cdata.text:
+                comment_text = cdata.text
+
+        if not collecting:
+            if comment_text is not None and start_marker in comment_text:
+                collecting = True
+                skip_cleanup = True  # Rung after the marker is the cleanup rung
+                state_transitions = defaultdict(set)
+            continue
+
+        if skip_cleanup:
+            skip_cleanup = False
+            continue
+
+        # Check if we've reached the end of STATE LOGIC section
+        if comment_text is not None and end_marker in comment_text:
+            break
 
         # Parse this rung
         source_state, target_states = parse_rung_logic(rung)
 
         if source_state is not None and target_states:
-            # Initialize set for this source state if not exists
-            if source_state not in state_transitions:
-                state_transitions[source_state] = set()
-
-            # Add all target states (set automatically handles duplicates)
+            # defaultdict creates the set on first touch; sets handle duplicates
             state_transitions[source_state].update(target_states)
 
-    return state_transitions
+    # Convert back to a plain dict to match the declared return type
+    return dict(state_transitions) if state_transitions is not None else None
+
+
+def build_state_transitions_streaming(
+    input_file,
+    start_marker: str = "STATE LOGIC",
+    end_marker: str = "FAULT"
+) -> Tuple[Optional[str], Optional[str], Optional[Dict[int, Set[int]]]]:
+    """
+    Stream state transitions straight from an L5X file with iterparse.
+
+    Avoids building a DOM for the rung scan: rungs are parsed as they stream
+    past and cleared immediately, so peak memory stays constant no matter how
+    large the routine is. Only rungs inside Programs are considered (add-on
+    instruction definitions also contain Routine elements).
+
+    Note: this reads the raw file, where Comment/Text content is plain CDATA
+    (elem.text), not the CDATAContent wrapper the l5x library introduces.
+
+    Args:
+        input_file: Path to the .L5X file
+        start_marker: Comment text that marks start of STATE LOGIC section
+        end_marker: Comment text that marks end of STATE LOGIC section
+
+    Returns:
+        Tuple of (program_name, routine_name, transitions dict),
+        or (None, None, None) if no STATE LOGIC section was found
+    """
+    program_name = None
+    routine_name = None
+    state_transitions = None
+    collecting = False
+    skip_cleanup = False
+    in_programs = False
+    current_program = None
+    current_routine = None
+
+    for event, elem in ET.iterparse(str(input_file), events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == 'Programs':
+                in_programs = True
+            elif elem.tag == 'Program':
+                current_program = elem.attrib.get('Name')
+            elif elem.tag == 'Routine':
+                current_routine = elem.attrib.get('Name')
+            continue
+
+        if elem.tag == 'Programs':
+            in_programs = False
+        elif elem.tag == 'Routine':
+            # The STATE LOGIC section never spans routines: once the marker's
+            # routine ends, stop rather than attributing later routines'
+            # rungs to it (the end marker is optional)
+            if collecting:
+                break
+        elif elem.tag == 'Rung' and in_programs:
+            comment = elem.find('Comment')
+            comment_text = comment.text if comment is not None else None
+
+            if not collecting:
+                if comment_text is not None and start_marker in comment_text:
+                    collecting = True
+                    skip_cleanup = True  # Rung after the marker is the cleanup rung
+                    state_transitions = defaultdict(set)
+                    program_name = current_program
+                    routine_name = current_routine
+            elif skip_cleanup:
+                skip_cleanup = False
+            elif comment_text is not None and end_marker in comment_text:
+                break
+            else:
+                text = elem.find('Text')
+                if text is not None and text.text:
+                    source_state, target_states = _parse_logic(text.text.strip())
+                    if source_state is not None and target_states:
+                        state_transitions[source_state].update(target_states)
+
+            # Drop the processed rung so memory stays bounded
+            elem.clear()
+
+    if state_transitions is not None:
+        state_transitions = dict(state_transitions)
+    return (program_name, routine_name, state_transitions)
+
+
+def _emit_flowchart(
+    title: str,
+    state_transitions: Dict[int, Set[int]],
+    state_names: Dict[int, str],
+    sorted_states: List[int]
+) -> str:
+    """Emit Mermaid 'flowchart TB' syntax from state transitions."""
+    # Pre-sort each source's targets once so the edge loops iterate plain lists
+    sorted_targets = {k: sorted(v) for k, v in state_transitions.items()}
+
+    lines = ['---',
+            'title: {title}'.format(title=title),
+            'config:',
+            '  layout: elk',
+            '---', '',
+            'flowchart TB', '']
+
+    # Generate node definitions
+    # Format: S{state_num}[State {state_num}, {state_name}]
+    for state_num in sorted_states:
+        name = state_names.get(state_num, f"State {state_num}")
+        # Clean up name for display (limit length, replace newlines)
+        clean_name = name.replace('\n', ' - ').translate(_NAME_TABLE)[:60]
+        lines.append(f'    S{state_num}[State {state_num}, {clean_name}]')
+
+    lines.append('')  # Blank line between nodes and edges
+
+    # States with exactly one outgoing transition get a double arrow; computed
+    # once up front so the edge loop is a set lookup (and terminal states -
+    # absent from state_transitions - no longer raise KeyError)
+    single_out = frozenset(
+        s for s, targets in state_transitions.items() if len(targets) == 1
+    )
+
+    # Generate edge definitions
+    for source_state in sorted(sorted_targets.keys()):
+        for target_state in sorted_targets[source_state]:
+            # Draw double line for 1 to 1 transitions
+            arrow = '==>' if target_state in single_out else '-->'
+            lines.append(f'    S{source_state} {arrow} S{target_state}')
+
+    return '\n'.join(lines)
+
+
+def _emit_state_diagram(
+    title: str,
+    state_transitions: Dict[int, Set[int]],
+    state_names: Dict[int, str],
+    sorted_states: List[int]
+) -> str:
+    """Emit Mermaid 'stateDiagram-v2' syntax from state transitions."""
+    # Pre-sort each source's targets once so the edge loops iterate plain lists
+    sorted_targets = {k: sorted(v) for k, v in state_transitions.items()}
+
+    lines = ['---',
+            'title: {title}'.format(title=title),
+            'config:',
+            '  layout: elk',
+            '---', '',
+            'stateDiagram-v2',
+            '    direction TB', '']
+
+    # Generate node definitions
+    # Format: State_{state_num} : State {state_num}, {state_name}
+    for state_num in sorted_states:
+        name = state_names.get(state_num, f"State {state_num}")
+        clean_name = name.replace('\n', ' - ')[:60]
+        lines.append(f'    S{state_num} : {state_num}. {clean_name}')
+
+    lines.append('')  # Blank line between nodes and edges
+
+    # Generate edge definitions
+
+    for source_state in sorted(sorted_targets.keys()):
+        for target_state in sorted_targets[source_state]:
+            lines.append(f'    S{source_state} --> S{target_state}')
+
+    return '\n'.join(lines)
 
 
 def generate_mermaid_flowchart(
     title: str,
     state_transitions: Dict[int, Set[int]],
-    state_names: Dict[int, str]
+    state_names: Dict[int, str],
+    sorted_states: List[int],
+    graph_format: str = 'state'
 ) -> str:
     """
-    Generate Mermaid flowchart syntax from state transitions.
+    Generate Mermaid diagram syntax from state transitions.
+
+    Dispatches to the emitter for the requested format instead of carrying
+    both layouts as branches in one function body.
 
     Args:
+        title: Diagram title
         state_transitions: Dict mapping source_state -> set of target_states
         state_names: Dict mapping state_number -> state_name
+        sorted_states: All state numbers, pre-sorted (computed once by caller)
+        graph_format: 'state' for stateDiagram-v2, 'flow' for flowchart
 
     Returns:
-        Mermaid flowchart syntax as string
+        Mermaid diagram syntax as string
     """
-    # Collect all unique state numbers
-    all_states = set(state_transitions.keys())
-    for targets in state_transitions.values():
-        all_states.update(targets)
-
-    graph_type = 'stateDiagram' if True else 'flowchart'  # Change to False to use flowchart
-
-    if graph_type == 'flowchart':
-        lines = ['---',
-                'title: {title}'.format(title=title),
-                'config:',
-                '  layout: elk',
-                '---', '',
-                'flowchart TB', '']
-
-        # Generate node definitions
-        # Format: S{state_num}[State {state_num}, {state_name}]
-        for state_num in sorted(all_states):
-            name = state_names.get(state_num, f"State {state_num}")
-            # Clean up name for display (limit length, replace newlines)
-            clean_name = name.replace('\n', ' - ')[:60]
-            clean_name = clean_name.replace('(', '<')[:60]
-            clean_name = clean_name.replace(')', '>')[:60]
-            lines.append(f'    S{state_num}[State {state_num}, {clean_name}]')
-
-        lines.append('')  # Blank line between nodes and edges
-
-        # Generate edge definitions
-        for source_state in sorted(state_transitions.keys()):
-            for target_state in sorted(state_transitions[source_state]):
-                # Draw double line for 1 to 1 transitions
-                if (len(state_transitions[target_state]) == 1):
-                    lines.append(f'    S{source_state} ==> S{target_state}')
-                else:
-                    lines.append(f'    S{source_state} --> S{target_state}')
-
-    elif graph_type == 'stateDiagram':
-        lines = ['---',
-                'title: {title}'.format(title=title),
-                'config:',
-                '  layout: elk',
-                '---', '',
-                'stateDiagram-v2',
-                '    direction TB', '']
-        
-        # Generate node definitions
-        # Format: State_{state_num} : State {state_num}, {state_name}
-        for state_num in sorted(all_states):
-            name = state_names.get(state_num, f"State {state_num}")
-            clean_name = name.replace('\n', ' - ')[:60]
-            lines.append(f'    S{state_num} : {state_num}. {clean_name}')
-
-        lines.append('')  # Blank line between nodes and edges
-
-        # Generate edge definitions
-
-        for source_state in sorted(state_transitions.keys()):
-            for target_state in sorted(state_transitions[source_state]):
-                lines.append(f'    S{source_state} --> S{target_state}')
-
-    return '\n'.join(lines)
+    emit = _emit_flowchart if graph_format == 'flow' else _emit_state_diagram
+    return emit(title, state_transitions, state_names, sorted_states)
 
 
 def save_mermaid_diagram(mermaid_text: str, output_path: Path):
@@ -262,11 +426,124 @@ def save_mermaid_diagram(mermaid_text: str, output_path: Path):
         mermaid_text: Mermaid flowchart syntax
         output_path: Path to output markdown file
     """
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('# State Logic Diagram\n\n')
-        f.write('```mermaid\n')
-        f.write(mermaid_text)
-        f.write('\n```\n')
+    # Assemble the document once and write it as UTF-8 bytes in one call,
+    # avoiding per-write text-codec overhead
+    document = '# State Logic Diagram\n\n```mermaid\n' + mermaid_text + '\n```\n'
+    Path(output_path).write_bytes(document.encode('utf-8'))
+
+
+def run(input_file, output_file, tag=None, graph_format='state', log=print):
+    """
+    Generate a state diagram from an L5X file.
+
+    This is the complete workflow (load, extract, generate, save) as a
+    callable function so GUI applications can invoke it in-process instead
+    of spawning a subprocess per generation.
+
+    Args:
+        input_file: Path to input .L5X file
+        output_file: Path to output markdown file
+        tag: Optional state tag name (auto-detects if None)
+        graph_format: 'state' for stateDiagram-v2, 'flow' for flowchart
+        log: Callable receiving progress messages (default: print)
+
+    Returns:
+        Summary dict with 'states', 'transitions', and 'output' keys
+
+    Raises:
+        FileNotFoundError: If input file doesn't exist
+        ValueError: If no STATE LOGIC section found or tag detection fails
+        l5x.InvalidFile: If input file is not valid L5X
+    """
+    # Deferred so importing this module (e.g. from the GUI) doesn't pay for
+    # l5x's XML machinery until a diagram is actually generated
+    import l5x
+
+    input_path = Path(input_file)
+    output_path = Path(output_file)
+
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file '{input_path}' not found")
+
+    # Load L5X project
+    log(f"Loading L5X file: {input_path}")
+    prj = l5x.Project(str(input_path))
+
+    # Find the routine with STATE LOGIC and build transitions by streaming
+    # the raw file - the rung scan never walks the in-memory DOM
+    log("Searching for STATE LOGIC section...")
+    program_name, routine_name, state_transitions = build_state_transitions_streaming(input_path)
+
+    if state_transitions is None:
+        raise ValueError("No STATE LOGIC section found in file")
+
+    log(f"Found STATE LOGIC in program: {program_name}, Routine: {routine_name}")
+
+    # Auto-detect tag name if not provided
+    tag_name = tag
+    log(f"Using state tag: {tag_name if tag_name else 'auto-detecting...'}")
+    if tag_name is None:
+        # Try to find a StateLogic tag. State tags follow the site naming
+        # convention (leading underscore, e.g. '_A28_PH'), so the cheap name
+        # filter keeps the data_type verification off the full tag list
+        tags = prj.controller.tags
+        candidates = [n for n in tags.names if n.startswith('_') or n.endswith('_PH')]
+        for tag_name_candidate in candidates:
+            if getattr(tags[tag_name_candidate], 'data_type', None) == 'StateLogic':
+                tag_name = tag_name_candidate
+                log(f"Auto-detected state tag: {tag_name}")
+                break
+
+    if tag_name is None:
+        raise ValueError("Could not auto-detect state tag. Please specify a tag name")
+
+    log(f"State transitions: {state_transitions}")
+
+    if not state_transitions:
+        log("Warning: No state transitions found")
+    else:
+        log(f"Found {len(state_transitions)} source states")
+
+    # Get all state names - all_states is built and sorted exactly once here,
+    # then shared with the flowchart generator
+    log("Retrieving state names...")
+    all_states = set().union(state_transitions.keys(), *state_transitions.values())
+    sorted_states = sorted(all_states)
+
+    # A missing tag falls back to numeric state names rather than aborting,
+    # matching the old per-state lookup-failure behavior
+    st0 = None
+    if tag_name in prj.controller.tags.names:
+        st0 = _resolve_st0(prj, tag_name)
+    else:
+        log(f"Warning: Tag '{tag_name}' not found; using numeric state names")
+
+    state_names = {}
+    for state_num in sorted_states:
+        state_names[state_num] = (
+            get_state_name(st0, state_num) if st0 is not None else f"State {state_num}"
+        )
+
+    # Generate Mermaid flowchart
+    log("Generating Mermaid flowchart...")
+    mermaid_text = generate_mermaid_flowchart(
+        routine_name, state_transitions, state_names, sorted_states, graph_format
+    )
+
+    # Save to file
+    save_mermaid_diagram(mermaid_text, output_path)
+
+    transitions_count = sum(len(targets) for targets in state_transitions.values())
+
+    log(f"\nSuccess! Diagram saved to: {output_path}")
+    log(f"States found: {sorted_states}")
+    log(f"Total transitions: {transitions_count}")
+
+    return {
+        'states': sorted_states,
+        'transitions': transitions_count,
+        'output': str(output_path)
+    }
 
 
 def main():
@@ -290,109 +567,49 @@ Examples:
         '-t', '--tag',
         help='State tag name (default: auto-detect first StateLogic tag)'
     )
+    parser.add_argument(
+        '--format',
+        choices=['state', 'flow'],
+        default='state',
+        help='Diagram format: stateDiagram-v2 or flowchart (default: state)'
+    )
+    parser.add_argument(
+        '-q', '--quiet',
+        action='store_true',
+        help='Suppress progress output; print a single JSON summary line'
+    )
 
     args = parser.parse_args()
 
     # Determine input and output paths
     input_path = Path(args.input_file)
-    if not input_path.exists():
-        print(f"Error: Input file '{input_path}' not found", file=sys.stderr)
-        sys.exit(1)
-
     if args.output:
         output_path = Path(args.output)
     else:
         output_path = input_path.with_name(f'{input_path.stem}_state_diagram.md')
 
     try:
-        # Load L5X project
-        print(f"Loading L5X file: {input_path}")
-        prj = l5x.Project(str(input_path))
-
-        # Find the routine with STATE LOGIC section
-        print("Searching for STATE LOGIC section...")
-        rll_content = None
-        routine_name = None
-
-        for program_name in prj.programs.names:
-            program = prj.programs[program_name]
-            routines_elem = program.element.find('Routines')
-            if routines_elem is not None:
-                for routine in routines_elem:
-                    temp_rll = routine.find('RLLContent')
-                    if temp_rll is not None:
-                        # Check if this routine has STATE LOGIC
-                        if find_state_logic_section(temp_rll) is not None:
-                            rll_content = temp_rll
-                            routine_name = routine.attrib.get('Name')
-                            break
-                if rll_content is not None:
-                    break
-
-        if rll_content is None:
-            print("Error: No STATE LOGIC section found in file", file=sys.stderr)
-            sys.exit(1)
-
-        print(f"Found STATE LOGIC in program: {program_name}, Routine: {routine_name}")
-
-        # Find STATE LOGIC section
-        state_logic_index = find_state_logic_section(rll_content)
-        print(f"STATE LOGIC section starts at rung index: {state_logic_index}")
-
-        # Auto-detect tag name if not provided
-        tag_name = args.tag
-        print(f"Using state tag: {tag_name if tag_name else 'auto-detecting...'}")
-        if tag_name is None:
-            # Try to find a StateLogic tag
-            for tag_name_candidate in prj.controller.tags.names:
-                try:
-                    tag = prj.controller.tags[tag_name_candidate]
-                    print(f"Checking tag '{tag_name_candidate}' for StateLogic...")
-                    if tag.data_type == 'StateLogic':
-                        tag_name = tag_name_candidate
-                        print(f"Auto-detected state tag: {tag_name}")
-                        break
-                except:
-                    continue
-
-        if tag_name is None:
-            print("Error: Could not auto-detect state tag. Please specify with -t option", file=sys.stderr)
-            sys.exit(1)
-
-        # Build state transitions map
-        print("Extracting state transitions...")
-        state_transitions = build_state_transitions(rll_content, state_logic_index)
-        print(f"State transitions: {state_transitions}")
-
-        if not state_transitions:
-            print("Warning: No state transitions found", file=sys.stderr)
-        else:
-            print(f"Found {len(state_transitions)} source states")
+        import l5x  # run() imports it anyway; bound here for the except clause
 
-        # Get all state names
-        print("Retrieving state names...")
-        all_states = set(state_transitions.keys())
-        for targets in state_transitions.values():
-            all_states.update(targets)
-            
-        state_names = {}
-        for state_num in all_states:
-            state_names[state_num] = get_state_name(prj, tag_name, state_num)
+        summary = run(
+            input_path, output_path,
+            tag=args.tag,
+            graph_format=args.format,
+            log=(lambda message: None) if args.quiet else print
+        )
 
-        # Generate Mermaid flowchart
-        print("Generating Mermaid flowchart...")
-        mermaid_text = generate_mermaid_flowchart(routine_name,state_transitions, state_names)
-
-        # Save to file
-        save_mermaid_diagram(mermaid_text, output_path)
-
-        print(f"\nSuccess! Diagram saved to: {output_path}")
-        print(f"States found: {sorted(all_states)}")
-        print(f"Total transitions: {sum(len(targets) for targets in state_transitions.values())}")
+        if args.quiet:
+            # One small machine-readable line instead of verbose progress -
+            # callers piping stdout don't drain the full log
+            import json
+            print(json.dumps(summary))
 
     except l5x.InvalidFile as e:
         print(f"Error: Invalid L5X file - {e}", file=sys.stderr)
         sys.exit(1)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         import traceback
@@ -1,10 +1,17 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+
 from PyInstaller.utils.hooks import collect_all
 
 datas = [
     ('template.html', '.'),
     ('script.js', '.'),
 ]
+# Generated by build_assets.py before the pyinstaller step (CI does this);
+# the GUI prefers this fused asset when present and falls back to the split
+# files otherwise, so a clean checkout still builds without it
+if os.path.exists('template_bundled.html'):
+    datas.append(('template_bundled.html', '.'))
 binaries = []
 hiddenimports = ['l5x_core']
 
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Build-time asset bundling for the L5X Mermaid GUI.
+
+Fuses template.html and script.js into a single template_bundled.html so
+the viewer ships one static asset: generate_html then performs one cached
+file read, and the packaged app no longer depends on resolving script.js
+through the viewer's base URL. Dev-time separation of the two source
+files is unchanged; the bundle is optional and the GUI falls back to the
+split files when it is absent.
+
+Run from this directory before packaging:
+
+    python build_assets.py
+"""
+
+from pathlib import Path
+
+_HERE = Path(__file__).parent
+
+# The external reference emitted by template.html, replaced by the inlined
+# script body in the bundle
+_SCRIPT_TAG = '<script src="script.js"></script>'
+
+
+def bundle_template(template_path=None, script_path=None, output_path=None):
+    """
+    Inline script.js into template.html and write template_bundled.html.
+
+    Args:
+        template_path: Source template (defaults to template.html here)
+        script_path: Script to inline (defaults to script.js here)
+        output_path: Bundle destination (defaults to template_bundled.html)
+
+    Returns:
+        Path to the written bundle
+    """
+    template_path = Path(template_path or _HERE / 'template.html')
+    script_path = Path(script_path or _HERE / 'script.js')
+    output_path = Path(output_path or _HERE / 'template_bundled.html')
+
+    html = template_path.read_text(encoding='utf-8')
+    js_code = script_path.read_text(encoding='utf-8')
+    inline_tag = f'<script>\n{js_code}\n</script>'
+
+    if _SCRIPT_TAG in html:
+        html = html.replace(_SCRIPT_TAG, inline_tag)
+    else:
+        html = html.replace('</body>', f'{inline_tag}\n</body>')
+
+    output_path.write_text(html, encoding='utf-8')
+    return output_path
+
+
+if __name__ == '__main__':
+    print(f'Wrote {bundle_template()}')
@@ -11,11 +11,37 @@ and used by CLI scripts, GUI applications, or other Python programs.
 Author: Generated with Claude Code
 """
 
+import io
 import l5x
 import re
+from collections import OrderedDict, defaultdict
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional, Union, Callable, Any
 
+# Compiled once at import - parse_rung_logic runs for every rung, where the
+# per-call pattern-cache lookup inside re.match/findall adds up
+_XIC_RE = re.compile(r'XIC\(([^)]+)\)')
+_OTL_RE = re.compile(r'OTL\(([^)]+)\)')
+_OTU_RE = re.compile(r'OTU\(([^)]+)\)')
+
+# Parentheses break mermaid node labels; swap them for tildes in one pass
+_NAME_TRANSLATE = str.maketrans({'(': '~', ')': '~'})
+
+# Diagram flavor emitted by generate_mermaid_flowchart; the matching emitter
+# is bound once at import time. Change to 'stateDiagram' for stateDiagram-v2
+GRAPH_TYPE = 'flowchart'
+
+# LRU cache of analysis results keyed on (path, mtime_ns, size, tag_name),
+# so re-generating a diagram for an unchanged file skips the L5X parse
+_DIAGRAM_CACHE: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+_DIAGRAM_CACHE_SIZE = 16
+
+
+def clear_diagram_cache():
+    """Invalidate all memoized generate_state_diagram results."""
+    _DIAGRAM_CACHE.clear()
+
 
 def extract_state_number(tag_reference: str) -> Optional[int]:
     """
@@ -31,10 +57,30 @@ def extract_state_number(tag_reference: str) -> Optional[int]:
     Returns:
         State number or None if not found
     """
-    match = re.search(r'\.(\d+)$', tag_reference)
-    if match:
-        return int(match.group(1))
-    return None
+    dot = tag_reference.rfind('.')
+    if dot < 0:
+        return None
+    try:
+        return int(tag_reference[dot + 1:])
+    except ValueError:
+        return None
+
+
+def _cdata_text(parent) -> Optional[str]:
+    """
+    Return the CDATAContent text of a Comment/Text element, or None.
+
+    The l5x library hands back stdlib ElementTree elements, so a compiled
+    lxml XPath can't be applied here; instead the repeated find + None-check
+    chains are collapsed into this one helper, which uses the C-accelerated
+    simple-tag find calls.
+    """
+    if parent is None:
+        return None
+    cdata = parent.find('CDATAContent')
+    if cdata is None:
+        return None
+    return cdata.text
 
 
 def get_state_name(prj: l5x.Project, tag_name: str, state_num: int) -> str:
@@ -69,6 +115,77 @@ def get_state_name(prj: l5x.Project, tag_name: str, state_num: int) -> str:
         return f"State {state_num}"
 
 
+def _load_st_descriptions(prj: l5x.Project, tag_name: str) -> Dict[int, str]:
+    """
+    Build a {bit_index: description} dict from a tag's comment XML in one walk.
+
+    State bit descriptions are stored as Comment elements with
+    Operand='.ST[0].N' under the tag's Comments element; collecting them all
+    in a single pass replaces one l5x tag-tree traversal per state bit.
+
+    Args:
+        prj: L5X Project object
+        tag_name: Name of the state tag (e.g., '_A28_PH')
+
+    Returns:
+        Dict mapping bit index -> description text (absent bits omitted)
+    """
+    descriptions = {}
+    try:
+        comments = prj.controller.tags[tag_name].element.find('Comments')
+    except KeyError:
+        return descriptions
+
+    if comments is None:
+        return descriptions
+
+    for comment in comments:
+        operand = comment.attrib.get('Operand', '')
+        if operand.startswith('.ST[0].'):
+            bit = operand.rpartition('.')[2]
+            if bit.isdigit():
+                text = _cdata_text(comment)
+                if text:
+                    descriptions[int(bit)] = text
+
+    return descriptions
+
+
+def get_state_names(
+    prj: l5x.Project,
+    tag_name: str,
+    state_nums
+) -> Dict[int, str]:
+    """
+    Get descriptive names for a batch of states in one tag resolution.
+
+    The bit descriptions are read from the tag's comment XML once (see
+    _load_st_descriptions), so each state lookup is a plain dict access.
+
+    Args:
+        prj: L5X Project object
+        tag_name: Name of the state tag (e.g., '_A28_PH')
+        state_nums: Iterable of state numbers (bit numbers)
+
+    Returns:
+        Dict mapping state_number -> state name (with "State {num}" fallbacks)
+    """
+    descriptions = _load_st_descriptions(prj, tag_name)
+
+    state_names = {}
+    for state_num in state_nums:
+        name = f"State {state_num}"
+        description = descriptions.get(state_num)
+        if description:
+            lines = description.strip().split('\n')
+            # First line is "State X", remaining lines are the name
+            if len(lines) > 1:
+                name = '\n'.join(lines[1:]).strip()
+        state_names[state_num] = name
+
+    return state_names
+
+
 def find_state_logic_section(rll_content) -> Optional[int]:
     """
     Find the index of the STATE LOGIC section marker rung.
@@ -80,11 +197,9 @@ def find_state_logic_section(rll_content) -> Optional[int]:
         Index of STATE LOGIC marker rung or None if not found
     """
     for i, rung in enumerate(rll_content):
-        comment = rung.find('Comment')
-        if comment is not None:
-            cdata = comment.find('CDATAContent')
-            if cdata is not None and cdata.text and 'STATE LOGIC' in cdata.text:
-                return i
+        comment_text = _cdata_text(rung.find('Comment'))
+        if comment_text and 'STATE LOGIC' in comment_text:
+            return i
     return None
 
 # Here we create a new method of finding the state logic section
@@ -100,17 +215,68 @@ def find_state_logic_section_by_otu(rll_content) -> Optional[int]:
         Index of STATE LOGIC marker rung or None if not found
     """
     for i, rung in enumerate(rll_content):
-        text = rung.find('Text')
-        if text is not None:
-            text_cdata = text.find('CDATAContent')
-            if text_cdata is not None and text_cdata.text:
-                logic = text_cdata.text.strip()
-                otu_match = re.search(r'OTU\(([^)]+)\)', logic)
-                if otu_match and 'S3_State_Logic' in otu_match.group(1):
-                    return i
+        logic = _cdata_text(rung.find('Text'))
+        if logic:
+            otu_match = _OTU_RE.search(logic.strip())
+            if otu_match and 'S3_State_Logic' in otu_match.group(1):
+                return i
     return None
 
 
+def _state_number_from_tail(tag_reference: str) -> Optional[int]:
+    """
+    Parse the trailing '.N' state number from a tag reference without regex.
+
+    Scans backward over the digits and checks the preceding character is a
+    dot - pure string ops, no regex engine dispatch.
+    """
+    i = len(tag_reference) - 1
+    while i >= 0 and tag_reference[i].isdigit():
+        i -= 1
+    if 0 <= i < len(tag_reference) - 1 and tag_reference[i] == '.':
+        return int(tag_reference[i + 1:])
+    return None
+
+
+def _parse_rung_text(logic: str) -> Tuple[Optional[int], List[int]]:
+    """
+    Extract source state (XIC) and target states (OTL) from rung logic text.
+
+    Single forward scan with str.find instead of separate regex passes; this
+    is the hot loop inside build_state_transitions, where regex setup cost
+    dominated on short strings.
+
+    Args:
+        logic: Stripped ladder logic text of one rung
+
+    Returns:
+        Tuple of (source_state_number, [target_state_numbers])
+    """
+    source_state = None
+    target_states = []
+
+    # A rung-leading XIC identifies the source state
+    if logic.startswith('XIC('):
+        close = logic.find(')', 4)
+        if close != -1:
+            source_state = _state_number_from_tail(logic[4:close])
+
+    pos = 0
+    while True:
+        start = logic.find('OTL(', pos)
+        if start == -1:
+            break
+        close = logic.find(')', start + 4)
+        if close == -1:
+            break
+        target_state = _state_number_from_tail(logic[start + 4:close])
+        if target_state is not None:
+            target_states.append(target_state)
+        pos = close + 1
+
+    return (source_state, target_states)
+
+
 def parse_rung_logic(rung) -> Tuple[Optional[int], List[int]]:
     """
     Parse a rung to extract source state (XIC) and target states (OTL).
@@ -122,36 +288,16 @@ def parse_rung_logic(rung) -> Tuple[Optional[int], List[int]]:
         Tuple of (source_state_number, [target_state_numbers])
         Returns (None, []) if rung is NOP or has no XIC
     """
-    text = rung.find('Text')
-    if text is None:
+    raw = _cdata_text(rung.find('Text'))
+    if not raw:
         return (None, [])
 
-    text_cdata = text.find('CDATAContent')
-    if text_cdata is None or not text_cdata.text:
+    # Skip NOP() rungs before paying for the strip() allocation; NOP is
+    # the most common rung type and always sits at the front
+    if 'NOP()' in raw[:10]:
         return (None, [])
 
-    logic = text_cdata.text.strip()
-
-    # Skip NOP() rungs
-    if logic.startswith('NOP()'):
-        return (None, [])
-
-    # Extract source state from first XIC
-    source_state = None
-    xic_match = re.match(r'XIC\(([^)]+)\)', logic)
-    if xic_match:
-        xic_tag = xic_match.group(1)
-        source_state = extract_state_number(xic_tag)
-
-    # Extract target states from all OTL instructions
-    target_states = []
-    otl_matches = re.findall(r'OTL\(([^)]+)\)', logic)
-    for otl_tag in otl_matches:
-        target_state = extract_state_number(otl_tag)
-        if target_state is not None:
-            target_states.append(target_state)
-
-    return (source_state, target_states)
+    return _parse_rung_text(raw.strip())
 
 
 def build_state_transitions(
@@ -170,35 +316,101 @@ def build_state_transitions(
     Returns:
         Dict mapping source_state -> set of target_states
     """
-    state_transitions = {}
-    rungs_list = list(rll_content)
+    state_transitions = defaultdict(set)
 
-    # Start from start_index + 2 to skip marker and cleanup rung
-    for i in range(start_index + 2, len(rungs_list)):
-        rung = rungs_list[i]
+    # Start from start_index + 2 to skip marker and cleanup rung; islice
+    # walks the children once instead of materializing them into a list
+    for rung in islice(rll_content, start_index + 2, None):
 
         # Check if we've reached the end of STATE LOGIC section
-        comment = rung.find('Comment')
-        if comment is not None:
-            cdata = comment.find('CDATAContent')
-            if cdata is not None and cdata.text and end_marker in cdata.text:
-                break
+        comment_text = _cdata_text(rung.find('Comment'))
+        if comment_text and end_marker in comment_text:
+            break
 
         # Parse this rung
         source_state, target_states = parse_rung_logic(rung)
 
         if source_state is not None and target_states:
-            # Initialize set for this source state if not exists
-            if source_state not in state_transitions:
-                state_transitions[source_state] = set()
+            # defaultdict creates the set on first touch; sets handle duplicates
+            state_transitions[source_state].update(target_states)
+
+    # Convert back to a plain dict to match the declared return type
+    return dict(state_transitions)
+
+
+def extract_state_logic(
+    rll_content,
+    end_marker: str = "FAULT"
+) -> Tuple[Optional[int], Optional[Any], Optional[Dict[int, Set[int]]], Optional[Set[int]]]:
+    """
+    Locate the STATE LOGIC section and collect its transitions in one pass.
+
+    Fuses find_state_logic_section_by_otu, build_state_transitions, and the
+    referenced-state collection so RLLContent is traversed exactly once
+    instead of once per step.
 
-            # Add all target states (set automatically handles duplicates)
+    Args:
+        rll_content: RLLContent XML element
+        end_marker: Comment text that marks end of STATE LOGIC section
+
+    Returns:
+        Tuple of (state_logic_index, cleanup_rung, state_transitions,
+        all_states), where cleanup_rung is the rung directly after the
+        marker (used by tag auto-detection, saving a positional re-index
+        of RLLContent); (None, None, None, None) if no STATE LOGIC marker
+        was found
+    """
+    state_logic_index = None
+    cleanup_rung = None
+    state_transitions = None
+    all_states = None
+    skip_cleanup = False
+
+    for i, rung in enumerate(rll_content):
+        if state_logic_index is None:
+            # Still searching for the OTU marker rung
+            logic = _cdata_text(rung.find('Text'))
+            if logic:
+                otu_match = _OTU_RE.search(logic.strip())
+                if otu_match and 'S3_State_Logic' in otu_match.group(1):
+                    state_logic_index = i
+                    skip_cleanup = True  # Rung after the marker is the cleanup rung
+                    state_transitions = defaultdict(set)
+                    all_states = set()
+            continue
+
+        if skip_cleanup:
+            skip_cleanup = False
+            cleanup_rung = rung
+            continue
+
+        # Check if we've reached the end of STATE LOGIC section
+        comment_text = _cdata_text(rung.find('Comment'))
+        if comment_text and end_marker in comment_text:
+            break
+
+        source_state, target_states = parse_rung_logic(rung)
+
+        if source_state is not None and target_states:
             state_transitions[source_state].update(target_states)
+            # Record referenced states here so no fixup loop is needed later
+            all_states.add(source_state)
+            all_states.update(target_states)
 
-    return state_transitions
+    if state_transitions is not None:
+        state_transitions = dict(state_transitions)
+    return (state_logic_index, cleanup_rung, state_transitions, all_states)
 
 
-def generate_mermaid_flowchart(
+def _collect_sorted_states(state_transitions: Dict[int, Set[int]]) -> Tuple[Set[int], List[int]]:
+    """Collect every referenced state number, returning (set, sorted list)."""
+    all_states = set(state_transitions.keys())
+    for targets in state_transitions.values():
+        all_states.update(targets)
+    return all_states, sorted(all_states)
+
+
+def _emit_flowchart(
     title: str,
     state_transitions: Dict[int, Set[int]],
     state_names: Dict[int, str]
@@ -214,73 +426,100 @@ def generate_mermaid_flowchart(
     Returns:
         Mermaid flowchart syntax as string
     """
-    # Collect all unique state numbers
-    all_states = set(state_transitions.keys())
-    for targets in state_transitions.values():
-        all_states.update(targets)
+    all_states, sorted_states = _collect_sorted_states(state_transitions)
+
+    # Stream output into a buffer instead of growing a list and joining
+    buf = io.StringIO()
+    buf.write('---\n'
+              f'title: {title}\n'
+              'config:\n'
+              '  layout: elk\n'
+              # 'theme: base', # Use 'base' to allow full customization
+              # 'themeVariables:',
+              # '   primaryColor: #BBDEF0',
+              # '   primaryTextColor: #000000',
+              # '   primaryBorderColor: #7C7C7C',
+              # '   lineColor: #F85A3E',
+              # '   secondaryColor: #006100',
+              # '   tertiaryColor: #fff',
+              '---\n'
+              'flowchart TB')
+
+    # Generate node definitions
+    # Format: S{state_num}[State {state_num}, {state_name}]
+    for state_num in sorted_states:
+        name = state_names.get(state_num, f"State {state_num}")
+        # Clean up name for display (limit length, replace newlines)
+        clean_name = name.replace('\n', ' - ').translate(_NAME_TRANSLATE)[:60]
+        buf.write(f'\n    S{state_num}[State {state_num}, {clean_name}]')
+
+    buf.write('\n')  # Blank line between nodes and edges
+
+    # Terminal states (no outgoing transitions) get a double arrow.
+    # Computed once up front: the old per-edge len(state_transitions[t])
+    # lookup raised KeyError for targets that never appear as sources
+    terminal_states = all_states - state_transitions.keys()
+
+    # Flatten the transition mapping into one sorted edge list, replacing
+    # the nested loop with its per-source sorts by a single pass
+    edges = sorted(
+        (source_state, target_state)
+        for source_state, targets in state_transitions.items()
+        for target_state in targets
+    )
+    for source_state, target_state in edges:
+        # Draw double line for transitions into terminal states
+        arrow = '==>' if target_state in terminal_states else '-->'
+        buf.write(f'\n    S{source_state} {arrow} S{target_state}')
 
-    graph_type = 'stateDiagram' if False else 'flowchart'  # Change to False to use flowchart
-
-    config_lines = [
-        '---',
-        'title: {title}'.format(title=title),
-        'config:',
-        '  layout: elk' if graph_type == 'flowchart' else '  layout: dagre',
-        # 'theme: base', # Use 'base' to allow full customization
-        # 'themeVariables:',
-        # '   primaryColor: #BBDEF0',
-        # '   primaryTextColor: #000000',
-        # '   primaryBorderColor: #7C7C7C',
-        # '   lineColor: #F85A3E',
-        # '   secondaryColor: #006100',
-        # '   tertiaryColor: #fff',
-        '---',
-        ''
-        'flowchart TB' if graph_type == 'flowchart' else 'stateDiagram-v2',
-    ]
-
-    if graph_type == 'flowchart':
-        lines = config_lines
-
-        # Generate node definitions
-        # Format: S{state_num}[State {state_num}, {state_name}]
-        for state_num in sorted(all_states):
-            name = state_names.get(state_num, f"State {state_num}")
-            # Clean up name for display (limit length, replace newlines)
-            clean_name = name.replace('\n', ' - ')[:60]
-            clean_name = clean_name.replace('(', '~')[:60]
-            clean_name = clean_name.replace(')', '~')[:60]
-            lines.append(f'    S{state_num}[State {state_num}, {clean_name}]')
-
-        lines.append('')  # Blank line between nodes and edges
-
-        # Generate edge definitions
-        for source_state in sorted(state_transitions.keys()):
-            for target_state in sorted(state_transitions[source_state]):
-                # Draw double line for 1 to 1 transitions
-                if (len(state_transitions[target_state]) == 0):
-                    lines.append(f'    S{source_state} ==> S{target_state}')
-                else:
-                    lines.append(f'    S{source_state} --> S{target_state}')
-
-    elif graph_type == 'stateDiagram':
-        lines = config_lines
-
-        # Generate node definitions
-        # Format: State_{state_num} : State {state_num}, {state_name}
-        for state_num in sorted(all_states):
-            name = state_names.get(state_num, f"State {state_num}")
-            clean_name = name.replace('\n', ' - ')[:60]
-            lines.append(f'    S{state_num} : {state_num}. {clean_name}')
-
-        lines.append('')  # Blank line between nodes and edges
-
-        # Generate edge definitions
-        for source_state in sorted(state_transitions.keys()):
-            for target_state in sorted(state_transitions[source_state]):
-                lines.append(f'    S{source_state} --> S{target_state}')
-
-    return '\n'.join(lines)
+    return buf.getvalue()
+
+
+def _emit_statediagram(
+    title: str,
+    state_transitions: Dict[int, Set[int]],
+    state_names: Dict[int, str]
+) -> str:
+    """
+    Generate Mermaid stateDiagram-v2 syntax from state transitions.
+
+    Same contract as _emit_flowchart, but emits the stateDiagram-v2
+    dialect with the dagre layout.
+    """
+    _, sorted_states = _collect_sorted_states(state_transitions)
+
+    buf = io.StringIO()
+    buf.write('---\n'
+              f'title: {title}\n'
+              'config:\n'
+              '  layout: dagre\n'
+              '---\n'
+              'stateDiagram-v2')
+
+    # Generate node definitions
+    # Format: State_{state_num} : State {state_num}, {state_name}
+    for state_num in sorted_states:
+        name = state_names.get(state_num, f"State {state_num}")
+        clean_name = name.replace('\n', ' - ')[:60]
+        buf.write(f'\n    S{state_num} : {state_num}. {clean_name}')
+
+    buf.write('\n')  # Blank line between nodes and edges
+
+    # Generate edge definitions, reusing the sorted state list
+    for source_state in sorted_states:
+        if source_state not in state_transitions:
+            continue
+        for target_state in sorted(state_transitions[source_state]):
+            buf.write(f'\n    S{source_state} --> S{target_state}')
+
+    return buf.getvalue()
+
+
+# Bind the configured emitter once at import time rather than branching on
+# the graph type inside every call
+generate_mermaid_flowchart = (
+    _emit_flowchart if GRAPH_TYPE == 'flowchart' else _emit_statediagram
+)
 
 
 def save_mermaid_diagram(mermaid_text: str, output_path: Union[str, Path]):
@@ -291,12 +530,10 @@ def save_mermaid_diagram(mermaid_text: str, output_path: Union[str, Path]):
         mermaid_text: Mermaid flowchart syntax
         output_path: Path to output markdown file
     """
-    output_path = Path(output_path)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('# State Logic Diagram\n\n')
-        f.write('```mermaid\n')
-        f.write(mermaid_text)
-        f.write('\n```\n')
+    Path(output_path).write_text(
+        f'# State Logic Diagram\n\n```mermaid\n{mermaid_text}\n```\n',
+        encoding='utf-8'
+    )
 
 
 def render_mermaid_to_svg(
@@ -377,88 +614,88 @@ def generate_state_diagram(
         if not input_path.exists():
             raise FileNotFoundError(f"Input file not found: {input_path}")
 
+        # Reuse a cached analysis when the file is unchanged; only the
+        # output file still needs to be written
+        file_stat = input_path.stat()
+        cache_key = (str(input_path.resolve()), file_stat.st_mtime_ns,
+                     file_stat.st_size, tag_name)
+        cached = _DIAGRAM_CACHE.get(cache_key)
+        if cached is not None:
+            _DIAGRAM_CACHE.move_to_end(cache_key)
+            progress(f"Reusing cached analysis for: {input_path.name}")
+            progress(f"Saving diagram to: {output_path.name}")
+            save_mermaid_diagram(cached['diagram_text'], output_path)
+            return {**cached, 'states': list(cached['states'])}
+
         # Load L5X project
         progress(f"Loading L5X file: {input_path.name}")
         prj = l5x.Project(str(input_path))
 
-        # Find the routine with STATE LOGIC section
+        # Find the routine with STATE LOGIC section; the same pass collects
+        # the transitions and referenced states (see extract_state_logic)
         progress("Searching for STATE LOGIC section...")
-        rll_content = None
-        routine_name = None
-        program_name = None
-        state_logic_index = None
-
-        for prog_name in prj.programs.names:
-            program = prj.programs[prog_name]
-            routines_elem = program.element.find('Routines')
-            if routines_elem is not None:
-                for routine in routines_elem:
-                    temp_rll = routine.find('RLLContent')
-                    if temp_rll is not None:
-                        # Check if this routine has STATE LOGIC
-                        state_logic_index = find_state_logic_section_by_otu(temp_rll)
-                        if state_logic_index is not None:
-                            rll_content = temp_rll
-                            routine_name = routine.attrib.get('Name')
-                            program_name = prog_name
-                            break
-                if rll_content is not None:
-                    break
-
-        if rll_content is None:
+        match = next(
+            (
+                (prog_name, routine, temp_rll, extracted)
+                for prog_name in prj.programs.names
+                # 'Routines/Routine' is compiled once and cached by
+                # ElementTree's path engine
+                for routine in prj.programs[prog_name].element.iterfind('Routines/Routine')
+                for temp_rll in (routine.find('RLLContent'),)
+                if temp_rll is not None
+                # Check if this routine has STATE LOGIC
+                for extracted in (extract_state_logic(temp_rll),)
+                if extracted[0] is not None
+            ),
+            None,
+        )
+
+        if match is None:
             raise ValueError("No STATE LOGIC section found in file")
 
+        program_name, routine, rll_content, \
+            (state_logic_index, state_logic_rung, state_transitions, all_states) = match
+        routine_name = routine.attrib.get('Name')
+
         progress(f"Found STATE LOGIC in program: {program_name}, Routine: {routine_name}")
 
-        # Auto-detect tag name if not provided; Should be the first tag on state_logic_index rung
+        # Auto-detect tag name if not provided; Should be the first tag on the
+        # rung after the marker, which the extraction pass already handed back
         if tag_name is None:
             progress("Auto-detecting state tag...")
             # Try to find a StateLogic tag
-            # Get the rung at state_logic_index
-            state_logic_rung = rll_content[state_logic_index + 1]
-            text = state_logic_rung.find('Text')
-            if text is not None:
-                text_cdata = text.find('CDATAContent')
-                if text_cdata is not None and text_cdata.text:
-                    logic = text_cdata.text.strip()
-                    xic_match = re.match(r'XIC\(([^)]+)\)', logic)
-                    progress("Logic: {logic} xic_match: {xic_match}".format(logic=logic, xic_match=xic_match))
-                    if xic_match:
-                        tag_reference = xic_match.group(1)
-                        tag_name_candidate = tag_reference.split('.')[0]
-                        try:
-                            tag = prj.controller.tags[tag_name_candidate]
-                            progress(f"Checking tag: {tag_name_candidate}")
-                            # Tag should have a '.ST' member
-                            if 'ST' in tag.names:
-                                tag_name = tag_name_candidate
-                                progress(f"Auto-detected state tag: {tag_name}")
-                        except:
-                            pass
+            raw = _cdata_text(state_logic_rung.find('Text')) if state_logic_rung is not None else None
+            if raw:
+                logic = raw.strip()
+                xic_match = _XIC_RE.match(logic)
+                progress("Logic: {logic} xic_match: {xic_match}".format(logic=logic, xic_match=xic_match))
+                if xic_match:
+                    tag_reference = xic_match.group(1)
+                    tag_name_candidate = tag_reference.partition('.')[0]
+                    # Membership test instead of try/except around the lookup
+                    if tag_name_candidate in prj.controller.tags.names:
+                        tag = prj.controller.tags[tag_name_candidate]
+                        progress(f"Checking tag: {tag_name_candidate}")
+                        # Tag should have a '.ST' member
+                        if 'ST' in tag.names:
+                            tag_name = tag_name_candidate
+                            progress(f"Auto-detected state tag: {tag_name}")
 
         if tag_name is None:
             raise ValueError("Could not auto-detect state tag. Please specify tag_name parameter.")
 
         progress(f"Using state tag: {tag_name}")
 
-        # Build state transitions map
-        progress("Extracting state transitions...")
-        state_transitions = build_state_transitions(rll_content, state_logic_index)
-
+        # Transitions and referenced states were already collected during the
+        # routine search pass
         if not state_transitions:
             progress("Warning: No state transitions found")
 
         progress(f"Found {len(state_transitions)} source states")
 
-        # Get all state names
+        # Get all state names with a single tag resolution
         progress("Retrieving state names...")
-        all_states = set(state_transitions.keys())
-        for targets in state_transitions.values():
-            all_states.update(targets)
-
-        state_names = {}
-        for state_num in all_states:
-            state_names[state_num] = get_state_name(prj, tag_name, state_num)
+        state_names = get_state_names(prj, tag_name, all_states)
 
         # Generate Mermaid flowchart
         progress("Generating Mermaid flowchart...")
@@ -472,7 +709,7 @@ def generate_state_diagram(
         transitions_count = sum(len(targets) for targets in state_transitions.values())
         states_list = sorted(all_states)
 
-        return {
+        result = {
             'success': True,
             'message': f"Diagram generated successfully",
             'states': states_list,
@@ -481,6 +718,13 @@ def generate_state_diagram(
             'error': None
         }
 
+        # Memoize for repeated runs against the same, unchanged file
+        _DIAGRAM_CACHE[cache_key] = {**result, 'states': list(states_list)}
+        if len(_DIAGRAM_CACHE) > _DIAGRAM_CACHE_SIZE:
+            _DIAGRAM_CACHE.popitem(last=False)
+
+        return result
+
     except FileNotFoundError as e:
         return {
             'success': False,